@@ -1,9 +1,12 @@
 """Configuration handling for the Flowport backend."""
 
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .services.response_cache import ResponseCacheMode
+
 
 class Settings(BaseSettings):
     """Application configuration values."""
@@ -12,15 +15,41 @@ class Settings(BaseSettings):
     storage_dir: Path = Path("data/knowledge_bases")
     prebuilt_dir: Path = Path("app/data/prebuilt")
     default_top_k: int = 4
+    response_cache_mode: ResponseCacheMode = ResponseCacheMode.ENABLED
+    response_cache_ttl_seconds: float = 3600.0
+    response_cache_max_entries: int = 1024
 
     model_config = SettingsConfigDict(env_prefix="FLOWPORT_", env_file=".env", env_file_encoding="utf-8")
 
 
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """Resolved, immutable settings used by the running application."""
+
+    app_name: str
+    storage_dir: Path
+    prebuilt_dir: Path
+    default_top_k: int
+    response_cache_mode: ResponseCacheMode
+    response_cache_ttl_seconds: float
+    response_cache_max_entries: int
+
+
 @lru_cache(maxsize=1)
-def get_settings() -> Settings:
-    """Return cached application settings."""
+def get_settings() -> RuntimeSettings:
+    """Return cached application settings.
+
+    Environment variables and the ``.env`` file are parsed once through
+    :class:`Settings`; callers then read plain slotted attributes.
+    """
 
     settings = Settings()
-    settings.storage_dir = Path(settings.storage_dir)
-    settings.prebuilt_dir = Path(settings.prebuilt_dir)
-    return settings
+    return RuntimeSettings(
+        app_name=settings.app_name,
+        storage_dir=Path(settings.storage_dir),
+        prebuilt_dir=Path(settings.prebuilt_dir),
+        default_top_k=settings.default_top_k,
+        response_cache_mode=settings.response_cache_mode,
+        response_cache_ttl_seconds=settings.response_cache_ttl_seconds,
+        response_cache_max_entries=settings.response_cache_max_entries,
+    )
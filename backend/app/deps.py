@@ -1,17 +1,99 @@
 """Dependency injection helpers for FastAPI routes."""
 
-from collections.abc import Generator
+from __future__ import annotations
+
+from typing import Any, Generic, TypeVar
+
+import httpx
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
-from .config import get_settings
 from .services.knowledge_base import KnowledgeBaseManager
+from .services.response_cache import ResponseCache
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def get_knowledge_base_manager(request: Request) -> KnowledgeBaseManager:
+    """Return the knowledge base manager shared by the running application."""
+
+    return request.app.state.kb_manager
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """Return the inference response cache shared by the running application."""
+
+    return request.app.state.response_cache
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Return the pooled HTTP client used for upstream provider calls."""
+
+    return request.app.state.http
+
+
+class JsonBody(Generic[ModelT]):
+    """Dependency that parses and validates a JSON request body in one pass.
+
+    FastAPI decodes bodies with ``json.loads`` before validating the resulting
+    dict; this hands the raw bytes straight to pydantic-core instead. Like
+    FastAPI, bodies sent with a non-JSON ``Content-Type`` are rejected; a
+    missing header is read as JSON. Pass :attr:`openapi_extra` to the route
+    decorator so the body stays documented.
+    """
+
+    def __init__(self, model: type[ModelT]) -> None:
+        self.adapter = TypeAdapter(model)
+        self.openapi_extra: dict[str, Any] = {
+            "requestBody": {
+                "required": True,
+                "content": {"application/json": {"schema": _inline_schema(model.model_json_schema())}},
+            }
+        }
+
+    async def __call__(self, request: Request) -> ModelT:
+        body = await request.body()
+        content_type = request.headers.get("content-type")
+        if content_type and not _is_json_media_type(content_type):
+            # FastAPI does not read other media types as JSON, so the body is
+            # reported as not being an object at all.
+            error = {
+                "type": "model_attributes_type",
+                "loc": ("body",),
+                "msg": "Input should be a valid dictionary or object to extract fields from",
+                "input": body.decode("utf-8", errors="replace"),
+            }
+            raise RequestValidationError([error], body=body)
+        try:
+            return self.adapter.validate_json(body)
+        except ValidationError as exc:
+            errors = [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            raise RequestValidationError(errors, body=body) from exc
+
+
+def _is_json_media_type(content_type: str) -> bool:
+    """Return whether *content_type* is ``application/json`` or another ``*+json`` type."""
+
+    subtype = content_type.split(";", 1)[0].strip().lower().partition("/")[2]
+    return subtype == "json" or subtype.endswith("+json")
+
+
+def _inline_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Resolve local ``$defs`` references so the schema can live in an operation."""
 
+    definitions = schema.pop("$defs", {})
 
-def get_knowledge_base_manager() -> Generator[KnowledgeBaseManager, None, None]:
-    """Yield a shared knowledge base manager instance."""
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/$defs/"):
+                siblings = {key: value for key, value in node.items() if key != "$ref"}
+                return {**resolve(definitions[ref.rsplit("/", 1)[-1]]), **resolve(siblings)}
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
 
-    settings = get_settings()
-    manager = KnowledgeBaseManager(settings.storage_dir, settings.prebuilt_dir)
-    try:
-        yield manager
-    finally:
-        manager.close()
+    return resolve(schema)
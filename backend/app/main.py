@@ -1,30 +1,46 @@
 """FastAPI entrypoint for Flowport backend."""
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
+from .middleware import PublicCORSMiddleware
 from .routers import inference, knowledge_bases
+from .services.http import close_shared_client, get_shared_client
+from .services.knowledge_base import KnowledgeBaseManager
+from .services.response_cache import ResponseCache
 
 
 settings = get_settings()
 
 app = FastAPI(title=settings.app_name)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(PublicCORSMiddleware)
 
 
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
     """Perform application startup tasks."""
 
     settings.storage_dir.mkdir(parents=True, exist_ok=True)
+    manager = KnowledgeBaseManager(settings.storage_dir, settings.prebuilt_dir)
+    manager.warm_up()
+    app.state.kb_manager = manager
+    app.state.response_cache = ResponseCache(
+        max_entries=settings.response_cache_max_entries,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+        mode=settings.response_cache_mode,
+    )
+    app.state.http = get_shared_client()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Release resources acquired during startup."""
+
+    manager: KnowledgeBaseManager | None = getattr(app.state, "kb_manager", None)
+    if manager is not None:
+        manager.close()
+    await close_shared_client()
 
 
 @app.get("/api/health", tags=["meta"])
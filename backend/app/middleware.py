@@ -0,0 +1,57 @@
+"""ASGI middleware for the Flowport backend."""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+_ALLOW_ORIGIN = (b"access-control-allow-origin", b"*")
+_PREFLIGHT_HEADERS = [
+    _ALLOW_ORIGIN,
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"0"),
+]
+
+
+class PublicCORSMiddleware:
+    """Allow cross-origin requests from any origin without credentials.
+
+    Starlette's ``CORSMiddleware`` parses and matches the origin, method and
+    headers on every request. The API is public and never relies on cookies,
+    so this emits a fixed wildcard header instead. Preflight requests are
+    answered directly; the only per-request value is the echoed
+    ``Access-Control-Request-Headers`` list, which a wildcard would not cover
+    for ``Authorization``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            requested_headers = None
+            is_preflight = False
+            for name, value in scope["headers"]:
+                if name == b"access-control-request-method":
+                    is_preflight = True
+                elif name == b"access-control-request-headers":
+                    requested_headers = value
+            if is_preflight:
+                headers = _PREFLIGHT_HEADERS
+                if requested_headers:
+                    headers = [*headers, (b"access-control-allow-headers", requested_headers)]
+                await send({"type": "http.response.start", "status": 200, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), _ALLOW_ORIGIN]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -81,35 +81,27 @@ class InferenceRequest(BaseModel):
     def validate_prompt_or_messages(self) -> "InferenceRequest":
         """Ensure at least a prompt or one user message is provided."""
 
-        has_prompt = bool(self.prompt and self.prompt.strip())
-        has_user_message = bool(
-            self.messages and any(message.role == ChatRole.user and message.content.strip() for message in self.messages)
-        )
-        if not (has_prompt or has_user_message):
-            raise ValueError("Provide a prompt or at least one user message")
-        return self
+        if self.prompt and self.prompt.strip():
+            return self
+        for message in self.messages or ():
+            if message.role == ChatRole.user and message.content.strip():
+                return self
+        raise ValueError("Provide a prompt or at least one user message")
 
     def resolve_api_key(self) -> str | None:
         """Return the API key for the selected provider, if available."""
 
-        if self.api_key:
-            return self.api_key.strip()
+        key = self.api_key
+        if key and (key := key.strip()):
+            return key
 
-        provider_key = None
         if self.api_keys:
-            provider_key = self.api_keys.get(self.provider)
-        if provider_key:
-            return provider_key.strip()
+            key = self.api_keys.get(self.provider)
+            if key and (key := key.strip()):
+                return key
 
         if self.provider == ProviderName.huggingface and self.hf_api_key:
-            return self.hf_api_key.strip()
-
-        # Accept provider-specific direct fields such as `openai_api_key`.
-        field_name = f"{self.provider.value}_api_key"
-        if hasattr(self, field_name):
-            value = getattr(self, field_name)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
+            return self.hf_api_key.strip() or None
 
         return None
 
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable, Sequence
+import string
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import lru_cache
 from typing import Any
 
 import httpx
@@ -11,7 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 
 from ..config import get_settings
-from ..deps import get_knowledge_base_manager
+from ..deps import JsonBody, get_http_client, get_knowledge_base_manager, get_response_cache
 from ..models.inference import (
     ChatMessage,
     ChatRole,
@@ -26,17 +28,59 @@ from ..services.huggingface import HuggingFaceClient
 from ..services.knowledge_base import KnowledgeBaseManager
 from ..services.llama import LlamaClient
 from ..services.openai import OpenAIClient
+from ..services.response_cache import ResponseCache, is_cacheable, response_cache_key
 
 
 router = APIRouter(prefix="/inference", tags=["inference"])
 
+# ``ChatMessage`` stores enum values, so roles are compared as plain (interned)
+# strings rather than through ``ChatRole`` members.
+_ROLE_SYSTEM = ChatRole.system.value
+_ROLE_USER = ChatRole.user.value
+_ROLE_ASSISTANT = ChatRole.assistant.value
+
+_ROLE_LABELS: dict[str, str] = {
+    _ROLE_SYSTEM: "System",
+    _ROLE_USER: "User",
+    _ROLE_ASSISTANT: "Assistant",
+}
+# System messages are lifted into Gemini's separate ``systemInstruction``.
+_GEMINI_ROLES: dict[str, str | None] = {
+    _ROLE_SYSTEM: None,
+    _ROLE_USER: "user",
+    _ROLE_ASSISTANT: "model",
+}
+
 
 def _render_context(matches: list[KnowledgeChunkMatch]) -> str:
-    lines = []
-    for match in matches:
-        title = match.document_title or match.document_id
-        lines.append(f"[{title}] (score={match.score:.3f})\n{match.content}")
-    return "\n\n".join(lines)
+    if not matches:
+        return ""
+    return "\n\n".join(
+        [
+            f"[{match.document_title or match.document_id}] (score={match.score:.3f})\n{match.content}"
+            for match in matches
+        ]
+    )
+
+
+_TEMPLATE_FIELDS = frozenset({"context", "prompt"})
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Callable[[Mapping[str, Any]], str]:
+    """Validate a context template once and return its reusable formatter.
+
+    Raises ``KeyError`` naming the first placeholder other than ``context`` or
+    ``prompt``, matching what ``str.format`` would raise on first use.
+    """
+
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if not field_name:
+            continue
+        root = field_name.partition(".")[0].partition("[")[0]
+        if root not in _TEMPLATE_FIELDS:
+            raise KeyError(root)
+    return template.format_map
 
 
 _TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
@@ -106,10 +150,15 @@ def _query_provided_knowledge(
     return [match for _, match in scored[:top_k]]
 
 
-@router.post("", response_model=InferenceResponse)
+_inference_body = JsonBody(InferenceRequest)
+
+
+@router.post("", response_model=InferenceResponse, openapi_extra=_inference_body.openapi_extra)
 async def run_inference(
-    payload: InferenceRequest,
+    payload: InferenceRequest = Depends(_inference_body),
     manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager),
+    cache: ResponseCache = Depends(get_response_cache),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ) -> InferenceResponse:
     """Execute an inference call with optional RAG context across providers."""
 
@@ -121,9 +170,7 @@ async def run_inference(
     matches: list[KnowledgeChunkMatch] = []
     context_text: str | None = None
 
-    messages = _prepare_messages(payload)
-
-    last_user_index = _find_last_user_index(messages)
+    messages, last_user_index = _prepare_messages(payload)
     if last_user_index is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one user message is required")
 
@@ -144,13 +191,13 @@ async def run_inference(
             context_text = _render_context(matches)
             template = payload.context_template or "{prompt}"
             try:
-                enriched = template.format(context=context_text, prompt=question)
+                enriched = _compile_template(template)({"context": context_text, "prompt": question})
             except KeyError as exc:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid context template missing key: {exc.args[0]}",
                 ) from exc
-            messages[last_user_index] = ChatMessage(role=ChatRole.user, content=enriched)
+            messages[last_user_index] = ChatMessage.model_construct(role=_ROLE_USER, content=enriched)
     elif provided_knowledge:
         top_k = payload.top_k or settings.default_top_k
         matches = _query_provided_knowledge(provided_knowledge, question, top_k)
@@ -158,16 +205,23 @@ async def run_inference(
             context_text = _render_context(matches)
             template = payload.context_template or "{prompt}"
             try:
-                enriched = template.format(context=context_text, prompt=question)
+                enriched = _compile_template(template)({"context": context_text, "prompt": question})
             except KeyError as exc:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid context template missing key: {exc.args[0]}",
                 ) from exc
-            messages[last_user_index] = ChatMessage(role=ChatRole.user, content=enriched)
+            messages[last_user_index] = ChatMessage.model_construct(role=_ROLE_USER, content=enriched)
 
     try:
-        provider_payload, output_text = await _dispatch_inference(payload.provider, api_key, payload, messages)
+        provider_payload, output_text = await _dispatch_inference(
+            payload.provider,
+            api_key,
+            payload,
+            messages,
+            cache,
+            http_client,
+        )
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text) from exc
     except httpx.HTTPError as exc:
@@ -185,32 +239,40 @@ async def run_inference(
     )
 
 
-def _prepare_messages(payload: InferenceRequest) -> list[ChatMessage]:
-    """Build the message history incorporating prompt and system instructions."""
+def _prepare_messages(payload: InferenceRequest) -> tuple[list[ChatMessage], int | None]:
+    """Build the message history and locate the user message that drives retrieval.
+
+    Returns the prepared messages together with the index of the last user
+    message, or ``None`` when the history contains no user turn.
+    """
 
-    messages = [ChatMessage(role=message.role, content=message.content.strip()) for message in payload.messages or []]
+    # Incoming messages were validated when the request was parsed, so stripped
+    # copies are built with ``model_construct`` and untouched ones are reused.
+    messages: list[ChatMessage] = []
+    for message in payload.messages or []:
+        content = message.content.strip()
+        if content == message.content:
+            messages.append(message)
+        else:
+            messages.append(ChatMessage.model_construct(role=message.role, content=content))
 
-    if payload.system_prompt and payload.system_prompt.strip():
-        system_entry = ChatMessage(role=ChatRole.system, content=payload.system_prompt.strip())
+    system_prompt = payload.system_prompt.strip() if payload.system_prompt else ""
+    if system_prompt:
+        system_entry = ChatMessage.model_construct(role=_ROLE_SYSTEM, content=system_prompt)
         # Ensure a leading system message without duplicating identical entries.
-        if not messages or messages[0].role != ChatRole.system or messages[0].content != system_entry.content:
+        if not messages or messages[0].role != _ROLE_SYSTEM or messages[0].content != system_entry.content:
             messages.insert(0, system_entry)
 
-    if payload.prompt and payload.prompt.strip():
-        has_user_message = any(message.role == ChatRole.user for message in messages)
-        if not has_user_message:
-            messages.append(ChatMessage(role=ChatRole.user, content=payload.prompt.strip()))
-
-    return messages
-
-
-def _find_last_user_index(messages: Sequence[ChatMessage]) -> int | None:
-    """Return the index of the last user message, if present."""
+    last_user_index = next(
+        (index for index in range(len(messages) - 1, -1, -1) if messages[index].role == _ROLE_USER),
+        None,
+    )
+    prompt = payload.prompt.strip() if payload.prompt else ""
+    if last_user_index is None and prompt:
+        messages.append(ChatMessage.model_construct(role=_ROLE_USER, content=prompt))
+        last_user_index = len(messages) - 1
 
-    for index in range(len(messages) - 1, -1, -1):
-        if messages[index].role == ChatRole.user:
-            return index
-    return None
+    return messages, last_user_index
 
 
 async def _dispatch_inference(
@@ -218,28 +280,52 @@ async def _dispatch_inference(
     api_key: str,
     payload: InferenceRequest,
     messages: list[ChatMessage],
+    cache: ResponseCache,
+    http_client: httpx.AsyncClient,
 ) -> tuple[Any, str | None]:
-    """Route the inference call to the correct provider and extract text output."""
+    """Serve the inference call from the response cache or forward it upstream."""
 
     parameters = dict(payload.parameters or {})
+    # Roles are already plain strings (use_enum_values), so the wire format used
+    # by the cache key and the chat-completion providers is built without model_dump.
+    chat_messages = [{"role": message.role, "content": message.content} for message in messages]
+    if not cache.readable or not is_cacheable(parameters):
+        return await _call_provider(provider, api_key, payload.model, messages, chat_messages, parameters, http_client)
+
+    key = response_cache_key(provider, payload.model, chat_messages, parameters, api_key)
+    return await cache.get_or_fetch(
+        key,
+        lambda: _call_provider(provider, api_key, payload.model, messages, chat_messages, parameters, http_client),
+    )
+
+
+async def _call_provider(
+    provider: ProviderName,
+    api_key: str,
+    model: str,
+    messages: list[ChatMessage],
+    chat_messages: list[dict[str, str]],
+    parameters: dict[str, Any],
+    http_client: httpx.AsyncClient,
+) -> tuple[Any, str | None]:
+    """Route the inference call to the correct provider and extract text output."""
 
     if provider == ProviderName.huggingface:
-        client = HuggingFaceClient(api_key)
+        hf_client = HuggingFaceClient(api_key, client=http_client)
         prompt_text = _render_messages_for_text_model(messages)
-        result = await client.text_inference(payload.model, prompt_text, parameters)
+        result = await hf_client.text_inference(model, prompt_text, parameters)
         return result, _extract_huggingface_text(result)
 
     if provider == ProviderName.openai:
-        client = OpenAIClient(api_key)
-        openai_messages = [message.model_dump() for message in messages]
-        result = await client.chat_completion(payload.model, openai_messages, parameters)
+        openai_client = OpenAIClient(api_key, client=http_client)
+        result = await openai_client.chat_completion(model, chat_messages, parameters)
         return result, _extract_openai_text(result)
 
     if provider == ProviderName.gemini:
-        client = GeminiClient(api_key)
+        gemini_client = GeminiClient(api_key, client=http_client)
         contents, system_instruction = _render_messages_for_gemini(messages)
-        result = await client.generate_content(
-            payload.model,
+        result = await gemini_client.generate_content(
+            model,
             contents,
             system_instruction=system_instruction,
             parameters=parameters,
@@ -247,9 +333,8 @@ async def _dispatch_inference(
         return result, _extract_gemini_text(result)
 
     if provider == ProviderName.llama:
-        client = LlamaClient(api_key)
-        llama_messages = [message.model_dump() for message in messages]
-        result = await client.chat_completion(payload.model, llama_messages, parameters)
+        llama_client = LlamaClient(api_key, client=http_client)
+        result = await llama_client.chat_completion(model, chat_messages, parameters)
         return result, _extract_openai_text(result)
 
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unsupported provider: {provider}")
@@ -258,18 +343,11 @@ async def _dispatch_inference(
 def _render_messages_for_text_model(messages: Iterable[ChatMessage]) -> str:
     """Render chat messages into a single text prompt."""
 
-    parts: list[str] = []
-    role_labels = {
-        ChatRole.system: "System",
-        ChatRole.user: "User",
-        ChatRole.assistant: "Assistant",
-    }
-    for message in messages:
-        label = role_labels.get(message.role, "Message")
-        content = message.content.strip()
-        if content:
-            parts.append(f"{label}: {content}")
-    return "\n\n".join(parts).strip()
+    return "\n\n".join(
+        f"{_ROLE_LABELS.get(message.role, 'Message')}: {content}"
+        for message in messages
+        if (content := message.content.strip())
+    )
 
 
 def _render_messages_for_gemini(
@@ -284,12 +362,11 @@ def _render_messages_for_gemini(
         text = message.content.strip()
         if not text:
             continue
-        if message.role == ChatRole.system:
+        gemini_role = _GEMINI_ROLES.get(message.role, "user")
+        if gemini_role is None:
             system_messages.append(text)
-        elif message.role == ChatRole.assistant:
-            contents.append({"role": "model", "parts": [{"text": text}]})
         else:
-            contents.append({"role": "user", "parts": [{"text": text}]})
+            contents.append({"role": gemini_role, "parts": [{"text": text}]})
 
     system_instruction = None
     if system_messages:
@@ -301,6 +378,14 @@ def _render_messages_for_gemini(
 def _extract_huggingface_text(payload: Any) -> str | None:
     """Best-effort extraction of generated text from Hugging Face responses."""
 
+    # Text generation endpoints answer with one of these two shapes.
+    try:
+        text = payload[0]["generated_text"] if isinstance(payload, list) else payload["generated_text"]
+        if isinstance(text, str):
+            return text
+    except (KeyError, TypeError, IndexError):
+        pass
+
     if isinstance(payload, str):
         return payload
 
@@ -327,55 +412,28 @@ def _extract_huggingface_text(payload: Any) -> str | None:
 
 
 def _extract_openai_text(payload: Any) -> str | None:
-    """Extract text from OpenAI-style chat completion responses."""
+    """Extract text from OpenAI-style chat completion responses.
 
-    if not isinstance(payload, dict):
-        return None
+    Only the first choice is read, which is the only one unless ``n`` is raised.
+    """
 
-    choices = payload.get("choices")
-    if not isinstance(choices, list):
+    try:
+        choice = payload["choices"][0]
+        text = choice["message"]["content"] if "message" in choice else choice.get("text")
+    except (KeyError, TypeError, IndexError, AttributeError):
         return None
-
-    for choice in choices:
-        if not isinstance(choice, dict):
-            continue
-        message = choice.get("message")
-        if isinstance(message, dict):
-            content = message.get("content")
-            if isinstance(content, str):
-                return content
-        content = choice.get("text")
-        if isinstance(content, str):
-            return content
-
-    return None
+    return text if isinstance(text, str) else None
 
 
 def _extract_gemini_text(payload: Any) -> str | None:
-    """Extract text from Gemini generateContent responses."""
+    """Extract text from Gemini generateContent responses.
 
-    if not isinstance(payload, dict):
-        return None
+    Only the first part of the first candidate is read, which is where Gemini
+    puts the generated text.
+    """
 
-    candidates = payload.get("candidates")
-    if not isinstance(candidates, list):
+    try:
+        text = payload["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, TypeError, IndexError):
         return None
-
-    for candidate in candidates:
-        if not isinstance(candidate, dict):
-            continue
-        content = candidate.get("content")
-        if isinstance(content, dict):
-            parts = content.get("parts")
-            if isinstance(parts, list):
-                for part in parts:
-                    if isinstance(part, dict):
-                        text = part.get("text")
-                        if isinstance(text, str):
-                            return text
-        # Top-level text in candidate
-        text = candidate.get("text")
-        if isinstance(text, str):
-            return text
-
-    return None
+    return text if isinstance(text, str) else None
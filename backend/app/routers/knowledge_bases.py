@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from starlette import status
 
-from ..deps import get_knowledge_base_manager
+from ..deps import JsonBody, get_knowledge_base_manager
 from ..models.knowledge_base import (
     KnowledgeBaseAutoBuildRequest,
     KnowledgeBaseCreateRequest,
@@ -23,6 +23,11 @@ from ..services.knowledge_base import KnowledgeBaseManager
 
 router = APIRouter(prefix="/knowledge-bases", tags=["knowledge-bases"])
 
+_create_body = JsonBody(KnowledgeBaseCreateRequest)
+_auto_build_body = JsonBody(KnowledgeBaseAutoBuildRequest)
+_text_ingest_body = JsonBody(TextIngestRequest)
+_query_body = JsonBody(KnowledgeBaseQueryRequest)
+
 
 @router.get("", response_model=list[KnowledgeBaseSummary])
 async def list_knowledge_bases(manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager)) -> list[KnowledgeBaseSummary]:
@@ -31,9 +36,14 @@ async def list_knowledge_bases(manager: KnowledgeBaseManager = Depends(get_knowl
     return manager.list_knowledge_bases()
 
 
-@router.post("", response_model=KnowledgeBaseDetail, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=KnowledgeBaseDetail,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_create_body.openapi_extra,
+)
 async def create_knowledge_base(
-    payload: KnowledgeBaseCreateRequest,
+    payload: KnowledgeBaseCreateRequest = Depends(_create_body),
     manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager),
 ) -> KnowledgeBaseDetail:
     """Create a new knowledge base."""
@@ -85,10 +95,15 @@ async def download_knowledge_document(
     return FileResponse(path, media_type=media_type, filename=filename)
 
 
-@router.post("/{kb_id}/ingest/text", response_model=KnowledgeDocument, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{kb_id}/ingest/text",
+    response_model=KnowledgeDocument,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_text_ingest_body.openapi_extra,
+)
 async def ingest_text(
     kb_id: str,
-    payload: TextIngestRequest,
+    payload: TextIngestRequest = Depends(_text_ingest_body),
     manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager),
 ) -> KnowledgeDocument:
     """Add free-form text to a knowledge base."""
@@ -125,9 +140,14 @@ async def ingest_file(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
-@router.post("/auto-build", response_model=KnowledgeBaseDetail, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/auto-build",
+    response_model=KnowledgeBaseDetail,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_auto_build_body.openapi_extra,
+)
 async def auto_build(
-    payload: KnowledgeBaseAutoBuildRequest,
+    payload: KnowledgeBaseAutoBuildRequest = Depends(_auto_build_body),
     manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager),
 ) -> KnowledgeBaseDetail:
     """Create a knowledge base from structured knowledge items."""
@@ -138,10 +158,10 @@ async def auto_build(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
-@router.post("/{kb_id}/query", response_model=KnowledgeBaseQueryResponse)
+@router.post("/{kb_id}/query", response_model=KnowledgeBaseQueryResponse, openapi_extra=_query_body.openapi_extra)
 async def query_knowledge_base(
     kb_id: str,
-    payload: KnowledgeBaseQueryRequest,
+    payload: KnowledgeBaseQueryRequest = Depends(_query_body),
     manager: KnowledgeBaseManager = Depends(get_knowledge_base_manager),
 ) -> KnowledgeBaseQueryResponse:
     """Retrieve the most relevant knowledge chunks for a query."""
@@ -0,0 +1,188 @@
+"""Packed on-disk storage for knowledge base chunks."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable
+
+fcntl: ModuleType | None
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Upper bound on buffers handed to a single writev call (POSIX IOV_MAX).
+_IOV_MAX = 1024
+
+
+class ChunkStore:
+    """Append-only chunk storage for a single knowledge base.
+
+    Chunk text is appended to ``data.bin`` and located through ``index.tsv``,
+    which holds one ``<chunk_id>\\t<offset>\\t<length>`` line per chunk in
+    insertion order. Reads slice a read-only memory map of ``data.bin``, so a
+    knowledge base costs one open no matter how many chunks it holds. Chunks
+    written as individual ``<chunk_id>.txt`` files by older versions are packed
+    into the store the first time it is opened.
+    """
+
+    data_filename = "data.bin"
+    index_filename = "index.tsv"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._data_path = directory / self.data_filename
+        self._index_path = directory / self.index_filename
+        self._lock = threading.Lock()
+        self._offsets: dict[str, tuple[int, int]] = {}
+        self._index_size = 0
+        self._mmap: mmap.mmap | None = None
+        self._migrate_legacy_files()
+
+    # ------------------------------------------------------------------
+
+    def append(self, chunks: Iterable[tuple[str, str | bytes]]) -> None:
+        """Persist ``(chunk_id, text)`` pairs at the end of the store.
+
+        Text may be given as ``str`` or as already UTF-8 encoded ``bytes``.
+        """
+
+        ids: list[str] = []
+        buffers: list[bytes] = []
+        for chunk_id, text in chunks:
+            ids.append(chunk_id)
+            buffers.append(text if isinstance(text, bytes) else text.encode("utf-8"))
+        if not buffers:
+            return
+
+        with self._lock:
+            self.directory.mkdir(exist_ok=True)
+            with self._data_path.open("ab", buffering=0) as handle:
+                fd = handle.fileno()
+                if fcntl is not None:
+                    # Other worker processes append to the same store; hold the
+                    # file lock from reading the end offset until the index is written.
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._append_locked(fd, ids, buffers)
+
+    def read(self, chunk_id: str) -> str:
+        """Return the text of ``chunk_id``, raising ``FileNotFoundError`` if unknown."""
+
+        self._refresh()
+        location = self._offsets.get(chunk_id)
+        if location is None:
+            raise FileNotFoundError(f"Chunk '{chunk_id}' not found")
+        offset, length = location
+        view = self._view(offset + length)
+        return view[offset : offset + length].decode("utf-8")
+
+    def items(self) -> list[tuple[str, str]]:
+        """Return every ``(chunk_id, text)`` pair in insertion order."""
+
+        self._refresh()
+        offsets = list(self._offsets.items())
+        if not offsets:
+            return []
+        view = self._view(max(offset + length for _, (offset, length) in offsets))
+        return [(chunk_id, view[offset : offset + length].decode("utf-8")) for chunk_id, (offset, length) in offsets]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    # ------------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """Pick up index lines appended since the last read, by us or another process."""
+
+        try:
+            size = self._index_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size == self._index_size:
+            return
+
+        with self._lock:
+            if size < self._index_size:
+                # The index was replaced; start over.
+                self._offsets = {}
+                self._index_size = 0
+            with self._index_path.open("rb") as handle:
+                handle.seek(self._index_size)
+                data = handle.read(size - self._index_size)
+            # Ignore a trailing partial line from a writer that is mid-append.
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                chunk_id, offset, length = line.split(b"\t")
+                self._offsets[chunk_id.decode("ascii")] = (int(offset), int(length))
+            self._index_size += end
+
+    def _view(self, end: int) -> mmap.mmap:
+        view = self._mmap
+        if view is not None and len(view) >= end:
+            return view
+        with self._lock:
+            view = self._mmap
+            if view is None or len(view) < end:
+                with self._data_path.open("rb") as handle:
+                    view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                # The previous map may still be sliced by another thread; it is
+                # released once the last reference goes away.
+                self._mmap = view
+        return view
+
+    def _append_locked(self, fd: int, ids: list[str], buffers: list[bytes]) -> None:
+        """Append to ``data.bin`` through *fd* and index the chunks; the caller holds the file lock."""
+
+        offset = os.lseek(fd, 0, os.SEEK_END)
+        _write_buffers(fd, buffers)
+        # Data is written before the index so an index line never points
+        # past the end of data.bin.
+        lines: list[str] = []
+        for chunk_id, encoded in zip(ids, buffers):
+            lines.append(f"{chunk_id}\t{offset}\t{len(encoded)}\n")
+            offset += len(encoded)
+        with self._index_path.open("ab", buffering=0) as index_handle:
+            _write_buffers(index_handle.fileno(), ["".join(lines).encode("ascii")])
+
+    def _migrate_legacy_files(self) -> None:
+        if self._index_path.exists() or not self.directory.is_dir():
+            return
+        if not any(self.directory.glob("*.txt")):
+            return
+        with self._data_path.open("ab", buffering=0) as handle:
+            fd = handle.fileno()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            # Another worker may have packed the files while we waited for the lock.
+            if self._index_path.exists():
+                return
+            legacy_files = sorted(self.directory.glob("*.txt"))
+            if not legacy_files:
+                return
+            self._append_locked(fd, [path.stem for path in legacy_files], [path.read_bytes() for path in legacy_files])
+            for path in legacy_files:
+                path.unlink(missing_ok=True)
+
+
+def _write_buffers(fd: int, buffers: list[bytes]) -> None:
+    """Write *buffers* to *fd* in order, gathering them with ``os.writev`` where available."""
+
+    writev = getattr(os, "writev", None)
+    if writev is None:  # pragma: no cover - Windows
+        buffers = [b"".join(buffers)]
+
+    for start in range(0, len(buffers), _IOV_MAX):
+        batch = buffers[start : start + _IOV_MAX]
+        written = writev(fd, batch) if writev is not None else os.write(fd, batch[0])
+        if written < sum(map(len, batch)):
+            # Short writes are rare on regular files; finish the batch plainly.
+            remainder = memoryview(b"".join(batch))[written:]
+            while remainder:
+                remainder = remainder[os.write(fd, remainder) :]
@@ -2,54 +2,72 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping
+from typing import Any, Mapping
 
 import httpx
 
+from ..utils.serialization import dumps
+from .http import DEFAULT_TIMEOUT, get_shared_client
+
+
+# Parameters forwarded at the top level of the request; anything else is
+# treated as a ``generationConfig`` entry.
+_TOP_LEVEL_KEYS = frozenset({"generationConfig", "safetySettings", "tools", "toolConfig", "candidateCount"})
+
 
 class GeminiClient:
     """Wrapper around the Gemini generateContent endpoint."""
 
     base_url = "https://generativelanguage.googleapis.com/v1beta"
 
-    def __init__(self, api_key: str, *, timeout: float = 60.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         if not api_key:
             raise ValueError("Gemini API key is required")
         self.api_key = api_key
         self.timeout = timeout
+        self._client = client
 
     async def generate_content(
         self,
         model: str,
-        contents: Iterable[Mapping[str, Any]],
+        contents: list[dict[str, Any]],
         *,
-        system_instruction: Mapping[str, Any] | None = None,
+        system_instruction: dict[str, Any] | None = None,
         parameters: Mapping[str, Any] | None = None,
     ) -> Any:
-        """Execute a generateContent call."""
+        """Execute a generateContent call.
+
+        ``contents`` and ``system_instruction`` are serialized as given, without
+        defensive copies, since they are built fresh for every call.
+        """
 
-        payload: dict[str, Any] = {
-            "contents": [dict(content) for content in contents],
-        }
+        payload: dict[str, Any] = {"contents": contents}
         if system_instruction:
-            payload["systemInstruction"] = dict(system_instruction)
+            payload["systemInstruction"] = system_instruction
 
         if parameters:
-            recognised_keys = {"generationConfig", "safetySettings", "tools", "toolConfig", "candidateCount"}
-            if any(key in recognised_keys for key in parameters):
+            if any(key in _TOP_LEVEL_KEYS for key in parameters):
                 for key, value in parameters.items():
-                    if key in recognised_keys:
+                    if key in _TOP_LEVEL_KEYS:
                         payload[key] = value
                     else:
                         payload.setdefault("generationConfig", {})[key] = value
             else:
                 payload["generationConfig"] = dict(parameters)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/models/{model}:generateContent",
-                params={"key": self.api_key},
-                json=payload,
-            )
+        client = self._client or get_shared_client()
+        response = await client.post(
+            f"{self.base_url}/models/{model}:generateContent",
+            params={"key": self.api_key},
+            headers={"Content-Type": "application/json"},
+            content=dumps(payload),
+            timeout=self.timeout,
+        )
         response.raise_for_status()
         return response.json()
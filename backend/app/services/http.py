@@ -0,0 +1,62 @@
+"""Shared HTTP client helpers for upstream provider calls."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_shared_client: httpx.AsyncClient | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_closer: asyncio.Task[None] | None = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use.
+
+    Must be called from a running event loop. Pooled connections belong to the
+    loop that opened them, so a new client is created if the loop has changed
+    (for example between separate ``asyncio.run`` calls). The previous client is
+    closed on its own loop: immediately if that loop is still running in another
+    thread, otherwise when that loop cancels its pending tasks on shutdown.
+    """
+
+    global _shared_client, _shared_loop, _closer
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_loop is not loop:
+        previous, previous_loop = _shared_client, _shared_loop
+        if previous is not None and not previous.is_closed and previous_loop is not None and previous_loop.is_running():
+            asyncio.run_coroutine_threadsafe(previous.aclose(), previous_loop)
+        _shared_client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _shared_loop = loop
+        _closer = loop.create_task(_close_on_loop_shutdown(_shared_client))
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the process-wide client if one was created."""
+
+    global _shared_client, _shared_loop, _closer
+    client, _shared_client, _shared_loop = _shared_client, None, None
+    closer, _closer = _closer, None
+    if closer is not None:
+        closer.cancel()
+    if client is not None:
+        await client.aclose()
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> None:
+    """Wait until cancelled, then close *client* while its loop can still run it.
+
+    ``asyncio.run`` cancels outstanding tasks before closing the loop, which is
+    the last point at which the pooled connections can be shut down cleanly.
+    """
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await client.aclose()
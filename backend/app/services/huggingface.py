@@ -6,17 +6,27 @@ from typing import Any
 
 import httpx
 
+from ..utils.serialization import dumps
+from .http import DEFAULT_TIMEOUT, get_shared_client
+
 
 class HuggingFaceClient:
     """Client for interacting with Hugging Face hosted models."""
 
     base_url = "https://api-inference.huggingface.co/models"
 
-    def __init__(self, api_key: str, *, timeout: float = 60.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         if not api_key:
             raise ValueError("Hugging Face API key is required")
         self.api_key = api_key
         self.timeout = timeout
+        self._client = client
 
     async def text_inference(self, model: str, inputs: str, parameters: dict[str, Any] | None = None) -> Any:
         """Execute a text inference call."""
@@ -24,12 +34,13 @@ class HuggingFaceClient:
         payload: dict[str, Any] = {"inputs": inputs}
         if parameters:
             payload["parameters"] = parameters
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/{model}",
-                headers=self._headers,
-                json=payload,
-            )
+        client = self._client or get_shared_client()
+        response = await client.post(
+            f"{self.base_url}/{model}",
+            headers={**self._headers, "Content-Type": "application/json"},
+            content=dumps(payload),
+            timeout=self.timeout,
+        )
         response.raise_for_status()
         return response.json()
 
@@ -41,12 +52,13 @@ class HuggingFaceClient:
     ) -> Any:
         """Generate a caption for an image using a hosted model."""
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/{model}",
-                headers={**self._headers, "Content-Type": "application/octet-stream"},
-                content=image_bytes,
-            )
+        client = self._client or get_shared_client()
+        response = await client.post(
+            f"{self.base_url}/{model}",
+            headers={**self._headers, "Content-Type": "application/octet-stream"},
+            content=image_bytes,
+            timeout=self.timeout,
+        )
         response.raise_for_status()
         return response.json()
 
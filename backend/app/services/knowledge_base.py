@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+import os
+import shutil
 import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Iterable
 
 import joblib
 import numpy as np
 from fastapi import UploadFile
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from ..models.knowledge_base import (
     KnowledgeBaseAutoBuildRequest,
@@ -28,10 +31,25 @@ from ..models.knowledge_base import (
     KnowledgeDocumentChunk,
     TextIngestRequest,
 )
+from ..utils.serialization import dumps, loads
 from ..utils.text import chunk_text, normalize_text, truncate
+from .chunk_store import ChunkStore
 from .huggingface import HuggingFaceClient
 
 
+logger = logging.getLogger(__name__)
+
+_IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg"})
+_COPY_BUFFER_SIZE = 1 << 20
+# Distinct queries remembered per loaded index.
+_QUERY_CACHE_SIZE = 256
+# Chunk count from which rare and ubiquitous terms are pruned from the vocabulary.
+_PRUNE_MIN_CHUNKS = 1000
+# PDFium is not thread-safe as a library, even across separate documents, and
+# extraction runs in worker threads; every pypdfium2 call happens under this lock.
+_PDFIUM_LOCK = threading.Lock()
+
+
 class KnowledgeBaseManager:
     """Manage knowledge bases stored on disk."""
 
@@ -46,15 +64,41 @@ class KnowledgeBaseManager:
         self.prebuilt_dir.mkdir(parents=True, exist_ok=True)
 
         self._locks: dict[str, threading.Lock] = {}
+        # kb_id -> (metadata file signature, parsed metadata); see _load_metadata
+        self._metadata: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+        # kb_id -> (index file signature, loaded index data)
+        self._indexes: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+        self._chunk_stores: dict[str, ChunkStore] = {}
+        # ((storage_dir mtime_ns, nlink), sorted kb ids) from the last complete scan
+        self._kb_dirs: tuple[tuple[int, int], list[str]] | None = None
 
         self._bootstrap_prebuilt_knowledge_bases()
 
     # ------------------------------------------------------------------
     # public API
 
-    def close(self) -> None:  # pragma: no cover - hook for future resources
+    def close(self) -> None:
         """Close resources held by the manager."""
 
+        self._indexes.clear()
+        self._metadata.clear()
+        for store in self._chunk_stores.values():
+            store.close()
+        self._chunk_stores.clear()
+
+    def warm_up(self) -> None:
+        """Load the index of every ready knowledge base so first queries are fast."""
+
+        for kb_id in self._iter_kb_dirs():
+            try:
+                if not self._load_metadata(kb_id).get("ready"):
+                    continue
+                self._load_index(kb_id)
+            except Exception:
+                # Warm-up is only an optimisation: a broken or incompatible index
+                # must fail that KB's queries, not the whole service's startup.
+                logger.warning("Skipping warm-up of knowledge base %r", kb_id, exc_info=True)
+
     # ------------------------------------------------------------------
 
     def list_knowledge_bases(self) -> list[KnowledgeBaseSummary]:
@@ -113,28 +157,6 @@ class KnowledgeBaseManager:
             return file_path, media_type, original_filename
         raise FileNotFoundError(f"Document '{doc_id}' not found in knowledge base '{kb_id}'")
 
-    def get_document(self, kb_id: str, doc_id: str) -> KnowledgeDocumentDetail:
-        metadata = self._load_metadata(kb_id)
-        document_entry = None
-        for entry in metadata.get("documents", []):
-            if entry.get("id") == doc_id:
-                document_entry = entry
-                break
-        if not document_entry:
-            raise FileNotFoundError(f"Document '{doc_id}' not found in knowledge base '{kb_id}'")
-
-        base_document = self._document_from_metadata_entry(document_entry)
-        chunk_ids = document_entry.get("chunk_ids", [])
-        chunks: list[KnowledgeDocumentChunk] = []
-        for chunk_id in chunk_ids:
-            try:
-                content = self._read_chunk(kb_id, chunk_id)
-            except FileNotFoundError:
-                continue
-            chunks.append(KnowledgeDocumentChunk(id=chunk_id, content=content))
-
-        return KnowledgeDocumentDetail(**base_document.model_dump(), chunks=chunks)
-
     def create_knowledge_base(
         self,
         payload: KnowledgeBaseCreateRequest,
@@ -150,22 +172,30 @@ class KnowledgeBaseManager:
         (kb_dir / "chunks").mkdir(exist_ok=True)
         (kb_dir / "files").mkdir(exist_ok=True)
 
-        now = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc).isoformat()
         metadata = {
             "id": kb_id,
             "name": payload.name,
             "description": payload.description,
             "source": source.value,
-            "created_at": now.isoformat(),
-            "updated_at": now.isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "documents": [],
+            "chunk_to_doc": {},
             "chunk_count": 0,
             "ready": False,
         }
         self._write_metadata(kb_id, metadata)
+        self._kb_dirs = None
         return self.get_knowledge_base(kb_id)
 
-    async def ingest_text(self, kb_id: str, payload: TextIngestRequest) -> KnowledgeDocument:
+    async def ingest_text(
+        self,
+        kb_id: str,
+        payload: TextIngestRequest,
+        *,
+        defer_index: bool = False,
+    ) -> KnowledgeDocument:
         chunks = chunk_text(payload.content, payload.chunk_size, payload.chunk_overlap)
         if not chunks:
             raise ValueError("Unable to chunk empty content")
@@ -174,9 +204,10 @@ class KnowledgeBaseManager:
             title=payload.title,
             original_filename=None,
             media_type="text/plain",
-            raw_bytes=payload.content.encode("utf-8"),
+            raw_data=payload.content.encode("utf-8"),
             chunks=chunks,
             metadata={},
+            defer_index=defer_index,
         )
 
     async def ingest_file(
@@ -189,33 +220,39 @@ class KnowledgeBaseManager:
         extracted_text: str | None = None,
         hf_api_key: str | None = None,
     ) -> KnowledgeDocument:
-        data = await upload.read()
-        if not data:
+        # Starlette has already spooled the upload to a temporary file; work from
+        # that handle instead of reading the whole body into memory.
+        data = upload.file
+        if not data.seek(0, os.SEEK_END):
             raise ValueError("Uploaded file is empty")
+        data.seek(0)
 
         media_type = upload.content_type or "application/octet-stream"
         title = Path(upload.filename or "document").stem or "Document"
 
         filename = upload.filename or "document"
-        text = extracted_text if extracted_text is not None else self._extract_text_from_file(
-            filename,
-            media_type,
-            data,
-        )
+        text = extracted_text
+        if text is None:
+            # PDF and CSV parsing is CPU-bound; run it in a worker thread so the
+            # event loop keeps serving other requests meanwhile.
+            text = await asyncio.to_thread(self._extract_text_from_file, filename, media_type, data)
         caption_text: str | None = None
         if hf_api_key and self._is_image_file(filename):
-            caption = await self._generate_image_caption(hf_api_key, data)
+            data.seek(0)
+            caption = await self._generate_image_caption(hf_api_key, data.read())
             if caption:
                 caption_text = caption
                 text = f"{caption}\n\n[Image: {filename}]"
-        chunks = chunk_text(text, chunk_size, chunk_overlap) or [f"Summary for {filename}: {truncate(text, 200)}"]
+        chunks = chunk_text(text, chunk_size, chunk_overlap) or [
+            normalize_text(f"Summary for {filename}: {truncate(text, 200)}")
+        ]
 
         return self._persist_document(
             kb_id,
             title=title,
             original_filename=upload.filename,
             media_type=media_type,
-            raw_bytes=data,
+            raw_data=data,
             chunks=chunks,
             metadata={
                 "generated_from_upload": True,
@@ -230,16 +267,21 @@ class KnowledgeBaseManager:
             KnowledgeBaseCreateRequest(name=payload.name, description=payload.description),
             source=KnowledgeBaseSource.USER,
         )
-        for item in payload.knowledge_items:
-            await self.ingest_text(
-                kb.id,
-                TextIngestRequest(
-                    title=item.title,
-                    content=item.content,
-                    chunk_size=payload.chunk_size,
-                    chunk_overlap=payload.chunk_overlap,
-                ),
-            )
+        try:
+            for item in payload.knowledge_items:
+                await self.ingest_text(
+                    kb.id,
+                    TextIngestRequest(
+                        title=item.title,
+                        content=item.content,
+                        chunk_size=payload.chunk_size,
+                        chunk_overlap=payload.chunk_overlap,
+                    ),
+                    defer_index=True,
+                )
+        finally:
+            # Fit once over all items rather than once per document.
+            self._build_index(kb.id)
         return self.get_knowledge_base(kb.id)
 
     def query(self, kb_id: str, query: str, top_k: int) -> KnowledgeBaseQueryResponse:
@@ -247,26 +289,40 @@ class KnowledgeBaseManager:
         if not metadata.get("ready"):
             raise ValueError("Knowledge base index is not ready yet")
 
-        index_path = self._index_path(kb_id)
-        if not index_path.exists():
-            raise FileNotFoundError("Knowledge base index missing; please rebuild")
-
-        index_data = joblib.load(index_path)
-        vectorizer: TfidfVectorizer = index_data["vectorizer"]
+        index_data = self._load_index(kb_id)
         matrix = index_data["matrix"]
         chunk_ids: list[str] = index_data["chunk_ids"]
 
-        query_vec = vectorizer.transform([query])
-        scores = cosine_similarity(query_vec, matrix).flatten()
-        if np.count_nonzero(scores) == 0:
+        counts = self._query_terms(index_data, query)
+        if not counts:
             return KnowledgeBaseQueryResponse(knowledge_base_id=kb_id, query=query, matches=[])
 
-        top_indices = scores.argsort()[::-1][:top_k]
+        # Queries that analyze to the same term counts ("How does Flowport work?"
+        # vs "how does flowport work") score identically. The cache lives on the
+        # loaded index, so a rebuild or reload starts a fresh one.
+        query_cache: OrderedDict[Any, list[KnowledgeChunkMatch]] = index_data["query_cache"]
+        cache_key = (top_k, frozenset(counts.items()))
+        cached = query_cache.get(cache_key)
+        if cached is not None:
+            query_cache.move_to_end(cache_key)
+            return KnowledgeBaseQueryResponse(knowledge_base_id=kb_id, query=query, matches=list(cached))
+
+        # TfidfVectorizer L2-normalises rows, so cosine similarity reduces to a
+        # single sparse mat-vec against the stored matrix.
+        scores = matrix @ self._query_vector(index_data, query, counts)
+        if not scores.any():
+            return KnowledgeBaseQueryResponse(knowledge_base_id=kb_id, query=query, matches=[])
+
+        k = min(top_k, scores.size)
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")]
+        chunk_to_doc = metadata.get("chunk_to_doc") or self._chunk_to_doc(metadata)
+        documents = {doc.get("id"): doc for doc in metadata.get("documents", [])}
         matches: list[KnowledgeChunkMatch] = []
         for idx in top_indices:
             chunk_id = chunk_ids[int(idx)]
             chunk_content = self._read_chunk(kb_id, chunk_id)
-            doc = self._find_document_by_chunk(metadata, chunk_id)
+            doc = documents.get(chunk_to_doc.get(chunk_id))
             matches.append(
                 KnowledgeChunkMatch(
                     chunk_id=chunk_id,
@@ -277,6 +333,9 @@ class KnowledgeBaseManager:
                 )
             )
 
+        query_cache[cache_key] = matches
+        if len(query_cache) > _QUERY_CACHE_SIZE:
+            query_cache.popitem(last=False)
         return KnowledgeBaseQueryResponse(knowledge_base_id=kb_id, query=query, matches=matches)
 
     # ------------------------------------------------------------------
@@ -289,34 +348,49 @@ class KnowledgeBaseManager:
         title: str,
         original_filename: str | None,
         media_type: str,
-        raw_bytes: bytes,
+        raw_data: bytes | BinaryIO,
         chunks: Iterable[str],
         metadata: dict[str, Any],
+        defer_index: bool = False,
     ) -> KnowledgeDocument:
-        doc_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc)
+        """Store a document's chunks and metadata and, unless deferred, rebuild the index.
 
-        chunk_ids: list[str] = []
-        chunks_dir = self._chunks_dir(kb_id)
-        chunks_dir.mkdir(exist_ok=True)
+        ``chunks`` must already be whitespace-normalized, as ``chunk_text``
+        returns them. ``raw_data`` is the original document, either as bytes or
+        as a seekable binary file that is copied into storage in blocks. Callers
+        that ingest several documents in a row pass ``defer_index=True`` and
+        call ``_build_index`` once afterwards.
+        """
 
-        for chunk in chunks:
-            normalized = normalize_text(chunk)
-            if not normalized:
-                continue
-            chunk_id = str(uuid.uuid4())
-            chunk_ids.append(chunk_id)
-            (chunks_dir / f"{chunk_id}.txt").write_text(normalized, encoding="utf-8")
+        # Fail before anything is written for a knowledge base that does not exist.
+        self._load_metadata(kb_id)
+
+        doc_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+
+        packed = [(str(uuid.uuid4()), chunk) for chunk in chunks if chunk]
 
-        if not chunk_ids:
+        if not packed:
             raise ValueError("No textual content was extracted from the provided data")
+        with self._get_lock(kb_id):
+            self._chunk_store(kb_id).append(packed)
+        chunk_ids = [chunk_id for chunk_id, _ in packed]
 
         files_dir = self._files_dir(kb_id)
         files_dir.mkdir(exist_ok=True)
         stored_filename: str | None = None
+        if isinstance(raw_data, bytes):
+            size_bytes = len(raw_data)
+        else:
+            size_bytes = raw_data.seek(0, os.SEEK_END)
+            raw_data.seek(0)
         if original_filename:
             safe_name = f"{doc_id}_{Path(original_filename).name}"
-            (files_dir / safe_name).write_bytes(raw_bytes)
+            with (files_dir / safe_name).open("wb") as target:
+                if isinstance(raw_data, bytes):
+                    target.write(raw_data)
+                else:
+                    shutil.copyfileobj(raw_data, target, _COPY_BUFFER_SIZE)
             stored_filename = safe_name
 
         metadata_entry = {
@@ -324,43 +398,150 @@ class KnowledgeBaseManager:
             "title": title,
             "original_filename": original_filename,
             "media_type": media_type,
-            "size_bytes": len(raw_bytes),
+            "size_bytes": size_bytes,
             "chunk_ids": chunk_ids,
             "chunk_count": len(chunk_ids),
-            "created_at": now.isoformat(),
+            "created_at": now,
             "metadata": metadata,
             "stored_filename": stored_filename,
         }
 
-        self._update_metadata(kb_id, metadata_entry)
-        self._build_index(kb_id)
+        self._update_metadata(kb_id, metadata_entry, now=now)
+        if not defer_index:
+            self._build_index(kb_id, now=now)
 
         return self._document_from_metadata_entry(metadata_entry)
 
-    def _build_index(self, kb_id: str) -> None:
-        metadata = self._load_metadata(kb_id)
-        chunks_dir = self._chunks_dir(kb_id)
-        chunk_files = sorted(chunks_dir.glob("*.txt"))
-        if not chunk_files:
-            metadata["ready"] = False
-            self._write_metadata(kb_id, metadata)
+    def _build_index(self, kb_id: str, *, now: str | None = None) -> None:
+        stored = self._chunk_store(kb_id).items()
+        if not stored:
+            with self._get_lock(kb_id):
+                metadata = self._load_metadata_for_update(kb_id)
+                metadata["ready"] = False
+                self._write_metadata(kb_id, metadata)
             return
 
-        chunk_texts: list[str] = []
-        chunk_ids: list[str] = []
-        for file_path in chunk_files:
-            content = file_path.read_text(encoding="utf-8")
-            chunk_texts.append(content)
-            chunk_ids.append(file_path.stem)
+        chunk_ids = [chunk_id for chunk_id, _ in stored]
+        chunk_texts = [content for _, content in stored]
+
+        vectorizer, matrix = self._fit_vectorizer(chunk_texts)
+        index_data = {"vectorizer": vectorizer, "matrix": matrix, "chunk_ids": chunk_ids}
+        index_path = self._index_path(kb_id)
+        # Readers memory-map the index, so never rewrite it in place: dump to a
+        # sibling file and swap it in, leaving existing mappings on the old inode.
+        tmp_path = self._temp_path(index_path)
+        try:
+            joblib.dump(index_data, tmp_path, compress=0)
+            os.replace(tmp_path, index_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._indexes[kb_id] = (self._file_signature(index_path), self._prepare_index(index_data))
+
+        with self._get_lock(kb_id):
+            metadata = self._load_metadata_for_update(kb_id)
+            metadata["chunk_count"] = len(chunk_ids)
+            metadata["ready"] = True
+            metadata["updated_at"] = now or datetime.now(timezone.utc).isoformat()
+            self._write_metadata(kb_id, metadata)
 
-        vectorizer = TfidfVectorizer(max_features=4096, stop_words="english")
-        matrix = vectorizer.fit_transform(chunk_texts)
-        joblib.dump({"vectorizer": vectorizer, "matrix": matrix, "chunk_ids": chunk_ids}, self._index_path(kb_id))
+    def _fit_vectorizer(self, chunk_texts: list[str]) -> tuple[TfidfVectorizer, Any]:
+        """Fit the TF-IDF model for a knowledge base and return it with its chunk matrix."""
 
-        metadata["chunk_count"] = len(chunk_ids)
-        metadata["ready"] = True
-        metadata["updated_at"] = datetime.now(timezone.utc).isoformat()
-        self._write_metadata(kb_id, metadata)
+        options: dict[str, Any] = {
+            "dtype": np.float32,
+            "sublinear_tf": True,
+            "stop_words": "english",
+            "ngram_range": (1, 2),
+        }
+        if len(chunk_texts) >= _PRUNE_MIN_CHUNKS:
+            # Only large corpora are pruned: on a handful of chunks min_df=2 would
+            # drop the rare terms that make a chunk findable, or every term.
+            try:
+                vectorizer = TfidfVectorizer(**options, min_df=2, max_df=0.95)
+                return vectorizer, vectorizer.fit_transform(chunk_texts)
+            except ValueError:
+                pass  # nothing survived pruning; fall through to the full vocabulary
+        vectorizer = TfidfVectorizer(**options)
+        return vectorizer, vectorizer.fit_transform(chunk_texts)
+
+    def _load_index(self, kb_id: str) -> dict[str, Any]:
+        index_path = self._index_path(kb_id)
+        try:
+            signature = self._file_signature(index_path)
+        except FileNotFoundError:
+            raise FileNotFoundError("Knowledge base index missing; please rebuild") from None
+
+        cached = self._indexes.get(kb_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with self._get_lock(kb_id):
+            cached = self._indexes.get(kb_id)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            # Uncompressed dumps let joblib map the matrix and idf arrays straight
+            # from the page cache, shared between worker processes.
+            index_data = self._prepare_index(joblib.load(index_path, mmap_mode="r"))
+            self._indexes[kb_id] = (signature, index_data)
+        return index_data
+
+    def _prepare_index(self, index_data: dict[str, Any]) -> dict[str, Any]:
+        """Attach the query-time state derived from the fitted vectorizer."""
+
+        vectorizer: TfidfVectorizer = index_data["vectorizer"]
+        index_data["analyzer"] = vectorizer.build_analyzer()
+        index_data["query_cache"] = OrderedDict()
+        try:
+            index_data["idf"] = vectorizer.idf_
+        except AttributeError:
+            # Indexes pickled by older scikit-learn releases keep their IDF in a
+            # form only ``transform`` understands; rebuild the KB to upgrade.
+            index_data["idf"] = None
+        return index_data
+
+    def _query_terms(self, index_data: dict[str, Any], query: str) -> dict[int, int]:
+        """Count the in-vocabulary terms of *query*, keyed by matrix column."""
+
+        vocabulary: dict[str, int] = index_data["vectorizer"].vocabulary_
+        counts: dict[int, int] = {}
+        for term in index_data["analyzer"](query):
+            column = vocabulary.get(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def _query_vector(self, index_data: dict[str, Any], query: str, counts: dict[int, int]) -> np.ndarray:
+        """Return the dense, L2-normalised TF-IDF vector of *query* from its term counts.
+
+        Equivalent to ``vectorizer.transform([query])`` but reuses the analyzer
+        built when the index was loaded instead of rebuilding it per call.
+        """
+
+        vectorizer: TfidfVectorizer = index_data["vectorizer"]
+        if index_data["idf"] is None:
+            return vectorizer.transform([query]).toarray().ravel()
+
+        columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if vectorizer.sublinear_tf:
+            weights = np.log(weights) + 1.0
+        weights *= index_data["idf"][columns]
+        weights /= np.linalg.norm(weights)
+
+        query_vec = np.zeros(len(vectorizer.vocabulary_), dtype=index_data["matrix"].dtype)
+        query_vec[columns] = weights
+        return query_vec
+
+    def _temp_path(self, path: Path) -> Path:
+        """Return a unique sibling of *path* to write before an atomic ``os.replace``."""
+
+        return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+    def _file_signature(self, path: Path) -> tuple[int, int, int]:
+        # Metadata and index files are always swapped in with os.replace, so
+        # every write gets a new inode even within one coarse mtime tick.
+        stat = path.stat()
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
     async def _generate_image_caption(self, api_key: str, data: bytes) -> str | None:
         try:
@@ -380,28 +561,65 @@ class KnowledgeBaseManager:
                 return caption.strip()
         return None
 
-    def _update_metadata(self, kb_id: str, document_entry: dict[str, Any]) -> None:
+    def _update_metadata(self, kb_id: str, document_entry: dict[str, Any], *, now: str) -> None:
         lock = self._get_lock(kb_id)
         with lock:
-            metadata = self._load_metadata(kb_id)
+            metadata = self._load_metadata_for_update(kb_id)
             documents: list[dict[str, Any]] = metadata.setdefault("documents", [])
             documents.append(document_entry)
+            if "chunk_to_doc" in metadata:
+                metadata["chunk_to_doc"].update(dict.fromkeys(document_entry["chunk_ids"], document_entry["id"]))
+            else:
+                # Metadata written before the chunk map existed; index every document.
+                metadata["chunk_to_doc"] = self._chunk_to_doc(metadata)
             metadata["document_count"] = len(documents)
             metadata["chunk_count"] = metadata.get("chunk_count", 0) + document_entry.get("chunk_count", 0)
-            metadata["updated_at"] = datetime.now(timezone.utc).isoformat()
+            metadata["updated_at"] = now
             metadata["ready"] = False
             self._write_metadata(kb_id, metadata)
 
     def _load_metadata(self, kb_id: str) -> dict[str, Any]:
+        """Return the cached metadata of *kb_id*, re-reading it only if the file changed.
+
+        The returned dict is shared between readers and must not be mutated;
+        writers use ``_load_metadata_for_update`` and replace it wholesale.
+        """
+
         metadata_path = self._metadata_path(kb_id)
-        if not metadata_path.exists():
-            raise FileNotFoundError(f"Knowledge base '{kb_id}' not found")
-        return json.loads(metadata_path.read_text(encoding="utf-8"))
+        try:
+            signature = self._file_signature(metadata_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Knowledge base '{kb_id}' not found") from None
+
+        cached = self._metadata.get(kb_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        metadata = loads(metadata_path.read_bytes())
+        self._metadata[kb_id] = (signature, metadata)
+        return metadata
+
+    def _load_metadata_for_update(self, kb_id: str) -> dict[str, Any]:
+        """Return a private copy of the on-disk metadata for a read-modify-write."""
+
+        metadata_path = self._metadata_path(kb_id)
+        try:
+            return loads(metadata_path.read_bytes())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Knowledge base '{kb_id}' not found") from None
 
     def _write_metadata(self, kb_id: str, metadata: dict[str, Any]) -> None:
         metadata_path = self._metadata_path(kb_id)
         metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        # Write a sibling file and rename it over metadata.json so a crash never
+        # leaves truncated JSON behind and readers always see a complete file.
+        tmp_path = self._temp_path(metadata_path)
+        try:
+            tmp_path.write_bytes(dumps(metadata, indent=True))
+            os.replace(tmp_path, metadata_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        # Publish the new dict in one assignment; readers see the old or new one.
+        self._metadata[kb_id] = (self._file_signature(metadata_path), metadata)
 
     def _document_from_metadata_entry(self, entry: dict[str, Any]) -> KnowledgeDocument:
         return KnowledgeDocument(
@@ -431,7 +649,35 @@ class KnowledgeBaseManager:
         )
 
     def _iter_kb_dirs(self) -> list[str]:
-        return sorted(p.name for p in self.storage_dir.iterdir() if p.is_dir() and (p / "metadata.json").exists())
+        """Return the ids of all knowledge bases, rescanning only when storage changed.
+
+        Adding or removing a KB directory bumps the storage directory's mtime and
+        its link count, so the cached listing is reused until another process (or
+        this one) does so. The link count catches changes within one timestamp
+        tick, since directory mtimes can be coarser than back-to-back creates.
+        """
+
+        stat = self.storage_dir.stat()
+        signature = (stat.st_mtime_ns, stat.st_nlink)
+        cached = self._kb_dirs
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        complete = True
+        kb_ids: list[str] = []
+        with os.scandir(self.storage_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                if os.path.exists(os.path.join(entry.path, "metadata.json")):
+                    kb_ids.append(entry.name)
+                else:
+                    complete = False
+        kb_ids.sort()
+        # A directory without metadata may be a KB that is still being created;
+        # its metadata appearing will not touch the storage mtime, so rescan.
+        self._kb_dirs = (signature, kb_ids) if complete else None
+        return kb_ids
 
     def _metadata_path(self, kb_id: str) -> Path:
         return self.storage_dir / kb_id / "metadata.json"
@@ -451,23 +697,29 @@ class KnowledgeBaseManager:
         return datetime.fromisoformat(value)
 
     def _read_chunk(self, kb_id: str, chunk_id: str) -> str:
-        path = self._chunks_dir(kb_id) / f"{chunk_id}.txt"
-        return path.read_text(encoding="utf-8")
+        return self._chunk_store(kb_id).read(chunk_id)
 
-    def _find_document_by_chunk(self, metadata: dict[str, Any], chunk_id: str) -> dict[str, Any]:
-        for doc in metadata.get("documents", []):
-            if chunk_id in doc.get("chunk_ids", []):
-                return doc
-        return {}
+    def _chunk_store(self, kb_id: str) -> ChunkStore:
+        store = self._chunk_stores.get(kb_id)
+        if store is None:
+            store = self._chunk_stores.setdefault(kb_id, ChunkStore(self._chunks_dir(kb_id)))
+        return store
+
+    def _chunk_to_doc(self, metadata: dict[str, Any]) -> dict[str, str]:
+        return {chunk_id: doc["id"] for doc in metadata.get("documents", []) for chunk_id in doc.get("chunk_ids", [])}
+
+    def _is_image_file(self, filename: str) -> bool:
+        return Path(filename).suffix.lower() in _IMAGE_SUFFIXES
 
     def _get_lock(self, kb_id: str) -> threading.Lock:
-        if kb_id not in self._locks:
-            self._locks[kb_id] = threading.Lock()
-        return self._locks[kb_id]
+        lock = self._locks.get(kb_id)
+        if lock is None:
+            lock = self._locks.setdefault(kb_id, threading.Lock())
+        return lock
 
     def _bootstrap_prebuilt_knowledge_bases(self) -> None:
         for json_path in sorted(self.prebuilt_dir.glob("*.json")):
-            data = json.loads(json_path.read_text(encoding="utf-8"))
+            data = loads(json_path.read_bytes())
             kb_id = data.get("id") or json_path.stem
             kb_dir = self.storage_dir / kb_id
             if kb_dir.exists():
@@ -488,37 +740,60 @@ class KnowledgeBaseManager:
                     title=title,
                     original_filename=None,
                     media_type="text/plain",
-                    raw_bytes=content.encode("utf-8"),
+                    raw_data=content.encode("utf-8"),
                     chunks=chunks,
                     metadata={"prebuilt": True, "source_file": json_path.name},
+                    defer_index=True,
                 )
             self._build_index(kb.id)
 
-    def _extract_text_from_file(self, filename: str, media_type: str, data: bytes) -> str:
-        import io
-
+    def _extract_text_from_file(self, filename: str, media_type: str, data: BinaryIO) -> str:
         suffix = Path(filename or "").suffix.lower()
         if suffix in {".txt", ".md", ".json", ".log"}:
-            return data.decode("utf-8", errors="ignore")
+            return data.read().decode("utf-8", errors="ignore")
         if suffix in {".csv"}:
             try:
                 import pandas as pd
 
-                df = pd.read_csv(io.BytesIO(data))
+                df = pd.read_csv(data)
                 return df.to_markdown(index=False)
             except Exception as exc:  # pragma: no cover - dependent on pandas internals
                 raise ValueError(f"Unable to parse CSV file: {exc}") from exc
         if suffix in {".pdf"}:
             try:
-                from PyPDF2 import PdfReader
-
-                reader = PdfReader(io.BytesIO(data))
-                pages = [normalize_text(page.extract_text() or "") for page in reader.pages]
+                pages = self._extract_pdf_pages(data)
                 return "\n".join(page for page in pages if page)
             except Exception as exc:  # pragma: no cover
                 raise ValueError(f"Unable to parse PDF file: {exc}") from exc
-        if suffix in {".png", ".jpg", ".jpeg"}:
+        if suffix in _IMAGE_SUFFIXES:
             return (
                 f"Image file {filename or ''} (MIME: {media_type}) - add a caption or text summary to enhance retrieval."
             )
-        return data.decode("utf-8", errors="ignore")
+        return data.read().decode("utf-8", errors="ignore")
+
+    def _extract_pdf_pages(self, data: BinaryIO) -> list[str]:
+        """Return the normalized text of each PDF page.
+
+        Uses PDFium through ``pypdfium2`` when it is installed, which is much
+        faster than PyPDF2's pure-Python parser, and falls back to PyPDF2.
+        """
+
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            from PyPDF2 import PdfReader
+
+            return [normalize_text(page.extract_text() or "") for page in PdfReader(data).pages]
+
+        raw_pages: list[str] = []
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    raw_pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        return [normalize_text(page) for page in raw_pages]
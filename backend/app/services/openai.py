@@ -6,17 +6,27 @@ from typing import Any, Iterable, Mapping
 
 import httpx
 
+from ..utils.serialization import dumps
+from .http import DEFAULT_TIMEOUT, get_shared_client
+
 
 class OpenAIClient:
     """Lightweight wrapper around OpenAI's chat completions endpoint."""
 
     base_url = "https://api.openai.com/v1"
 
-    def __init__(self, api_key: str, *, timeout: float = 60.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         if not api_key:
             raise ValueError("OpenAI API key is required")
         self.api_key = api_key
         self.timeout = timeout
+        self._client = client
 
     async def chat_completion(
         self,
@@ -36,12 +46,13 @@ class OpenAIClient:
                     continue
                 payload[key] = value
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=self._headers,
-                json=payload,
-            )
+        client = self._client or get_shared_client()
+        response = await client.post(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers,
+            content=dumps(payload),
+            timeout=self.timeout,
+        )
         response.raise_for_status()
         return response.json()
 
@@ -0,0 +1,165 @@
+"""In-process cache for upstream inference responses."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from enum import Enum
+from typing import Any
+
+
+class ResponseCacheMode(str, Enum):
+    """Policies controlling how cached inference responses are used."""
+
+    ENABLED = "enabled"
+    REPLAY = "replay"
+    DISABLED = "disabled"
+
+
+CachedResponse = tuple[Any, str | None]
+
+
+def response_cache_key(
+    provider: str,
+    model: str,
+    messages: Sequence[Mapping[str, Any]],
+    parameters: Mapping[str, Any],
+    api_key: str,
+) -> str:
+    """Return a deterministic key for an upstream inference call.
+
+    The API key is folded into the digest so a cached response is only served
+    to callers presenting the same credentials.
+    """
+
+    serialized = json.dumps(
+        {
+            "p": provider,
+            "m": model,
+            "msgs": [{"role": message["role"], "content": message["content"]} for message in messages],
+            "params": parameters,
+            "k": hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(parameters: Mapping[str, Any]) -> bool:
+    """Return whether a call with *parameters* explicitly asks for greedy decoding.
+
+    Providers sample by default (OpenAI and Llama default to temperature 1), so a
+    call is only cacheable when it sets ``temperature`` to 0, at the top level or
+    in Gemini's ``generationConfig``, or turns Hugging Face's ``do_sample`` off.
+    """
+
+    if parameters.get("stream"):
+        return False
+    generation_config = parameters.get("generationConfig")
+    deterministic = False
+    for source in (parameters, generation_config if isinstance(generation_config, Mapping) else {}):
+        temperature = source.get("temperature")
+        if isinstance(temperature, (int, float)) and not isinstance(temperature, bool):
+            if temperature > 0:
+                return False
+            deterministic = True
+        do_sample = source.get("do_sample")
+        if do_sample is True:
+            return False
+        if do_sample is False:
+            deterministic = True
+    return deterministic
+
+
+class ResponseCache:
+    """TTL-bounded LRU cache of ``(provider_payload, output_text)`` pairs.
+
+    Concurrent misses for the same key are coalesced so only one upstream call
+    is in flight per key.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        mode: ResponseCacheMode = ResponseCacheMode.ENABLED,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.mode = mode
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._inflight: dict[str, asyncio.Future[CachedResponse]] = {}
+
+    @property
+    def readable(self) -> bool:
+        return self.mode != ResponseCacheMode.DISABLED
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == ResponseCacheMode.ENABLED
+
+    async def get(self, key: str) -> CachedResponse | None:
+        """Return the cached response for *key* if present and not expired."""
+
+        if not self.readable:
+            return None
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: CachedResponse) -> None:
+        """Store *value* under *key*, evicting the least recently used entries."""
+
+        if not self.writable:
+            return
+        async with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        """Return the cached response for *key*, calling *fetch* at most once per miss.
+
+        Callers arriving while a fetch for *key* is running await the same
+        result (or exception). The fetch runs as its own task, so a caller that
+        is cancelled does not cancel it for the others.
+        """
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        result = await fetch()
+        await self.set(key, result)
+        return result
+
+    def _finish_inflight(self, key: str, task: asyncio.Future[CachedResponse]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away.
+            task.exception()
@@ -0,0 +1,36 @@
+"""JSON serialization helpers that prefer ``orjson`` when it is installed."""
+
+from __future__ import annotations
+
+import json
+from types import ModuleType
+from typing import Any
+
+orjson: ModuleType | None
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(value: Any, *, indent: bool = False) -> bytes:
+    """Serialize *value* to UTF-8 encoded JSON, compact unless *indent* is set."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None)
+        except orjson.JSONEncodeError:
+            # orjson rejects values the stdlib accepts, such as integers wider
+            # than 64 bits or non-string keys; encode those the slow way.
+            pass
+    if indent:
+        return json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from *data* without decoding bytes to ``str`` first when possible."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
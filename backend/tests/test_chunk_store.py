@@ -0,0 +1,24 @@
+"""Tests for the packed chunk store."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.services.chunk_store import ChunkStore
+
+
+def test_concurrent_opens_migrate_legacy_files_once(tmp_path: Path) -> None:
+    contents = {f"chunk-{index:04d}": f"Legacy chunk number {index}." for index in range(2000)}
+    for chunk_id, text in contents.items():
+        (tmp_path / f"{chunk_id}.txt").write_text(text, encoding="utf-8")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        stores = list(pool.map(lambda _: ChunkStore(tmp_path), range(2)))
+
+    index_lines = (tmp_path / ChunkStore.index_filename).read_text(encoding="ascii").splitlines()
+    assert len(index_lines) == len(contents)
+    assert not list(tmp_path.glob("*.txt"))
+    for store in stores:
+        assert dict(store.items()) == contents
+        store.close()
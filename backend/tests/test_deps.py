@@ -0,0 +1,110 @@
+"""Tests for the JSON body dependency used by the API routes."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.deps import get_knowledge_base_manager
+from app.routers import inference, knowledge_bases
+from app.services.knowledge_base import KnowledgeBaseManager
+
+
+@pytest.fixture()
+def app(tmp_path: Path) -> FastAPI:
+    manager = KnowledgeBaseManager(tmp_path / "storage", tmp_path / "prebuilt")
+    app = FastAPI()
+    app.include_router(knowledge_bases.router, prefix="/api")
+    app.include_router(inference.router, prefix="/api")
+    app.dependency_overrides[get_knowledge_base_manager] = lambda: manager
+    return app
+
+
+@pytest.fixture()
+def client(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+
+def test_valid_body_is_parsed(client: TestClient) -> None:
+    response = client.post("/api/knowledge-bases", json={"name": "Docs", "description": "Handbook"})
+    assert response.status_code == 201
+    assert response.json()["name"] == "Docs"
+
+    response = client.post(
+        "/api/knowledge-bases/auto-build",
+        json={"name": "Faq", "knowledge_items": [{"title": "Refunds", "content": "Refunds take five days."}]},
+    )
+    assert response.status_code == 201
+    kb_id = response.json()["id"]
+
+    response = client.post(f"/api/knowledge-bases/{kb_id}/query", json={"query": "refunds", "top_k": 1})
+    assert response.status_code == 200
+    assert len(response.json()["matches"]) == 1
+
+
+@pytest.mark.parametrize(
+    ("path", "payload", "field"),
+    [
+        ("/api/knowledge-bases", {"description": "No name"}, "name"),
+        ("/api/knowledge-bases/auto-build", {"knowledge_items": []}, "name"),
+        ("/api/knowledge-bases/kb/query", {"top_k": 3}, "query"),
+        ("/api/inference", {"provider": "openai"}, "model"),
+    ],
+)
+def test_missing_field_is_reported_under_body(client: TestClient, path: str, payload: dict, field: str) -> None:
+    response = client.post(path, json=payload)
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert any(error["loc"] == ["body", field] and error["type"] == "missing" for error in errors)
+
+
+def test_invalid_json_is_rejected(client: TestClient) -> None:
+    response = client.post(
+        "/api/knowledge-bases/kb/query",
+        content=b'{"query": ',
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+@pytest.mark.parametrize("content_type", ["text/plain", "application/x-www-form-urlencoded"])
+def test_non_json_content_type_is_rejected(client: TestClient, content_type: str) -> None:
+    response = client.post("/api/knowledge-bases", content=b'{"name": "Docs"}', headers={"Content-Type": content_type})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == [
+        {
+            "type": "model_attributes_type",
+            "loc": ["body"],
+            "msg": "Input should be a valid dictionary or object to extract fields from",
+            "input": '{"name": "Docs"}',
+        }
+    ]
+
+
+@pytest.mark.parametrize("headers", [{}, {"Content-Type": "application/vnd.flowport+json; charset=utf-8"}])
+def test_json_content_types_and_missing_header_are_parsed(client: TestClient, headers: dict[str, str]) -> None:
+    response = client.post("/api/knowledge-bases", content=b'{"name": "Docs"}', headers=headers)
+
+    assert response.status_code == 201
+
+
+def test_openapi_documents_request_bodies(client: TestClient) -> None:
+    paths = client.get("/openapi.json").json()["paths"]
+
+    for path, field in [
+        ("/api/inference", "model"),
+        ("/api/knowledge-bases", "name"),
+        ("/api/knowledge-bases/auto-build", "knowledge_items"),
+        ("/api/knowledge-bases/{kb_id}/query", "query"),
+    ]:
+        body = paths[path]["post"]["requestBody"]
+        schema = body["content"]["application/json"]["schema"]
+        assert body["required"] is True
+        assert field in schema["properties"]
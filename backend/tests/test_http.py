@@ -0,0 +1,43 @@
+"""Tests for the shared upstream HTTP client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from app.services.http import close_shared_client, get_shared_client
+
+
+def test_shared_client_is_closed_with_its_event_loop() -> None:
+    async def acquire() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+        return get_shared_client(), get_shared_client()
+
+    first, again = asyncio.run(acquire())
+    assert first is again
+    assert first.is_closed
+
+    async def acquire_and_close() -> httpx.AsyncClient:
+        client = get_shared_client()
+        await close_shared_client()
+        return client
+
+    second = asyncio.run(acquire_and_close())
+    assert second is not first
+    assert second.is_closed
+
+
+def test_client_left_on_another_running_loop_is_closed() -> None:
+    async def in_other_loop() -> httpx.AsyncClient:
+        return get_shared_client()
+
+    async def scenario() -> None:
+        client = get_shared_client()
+        # The close is scheduled on this loop before the worker thread's result
+        # is delivered back to it, so it has started by the time we resume.
+        replacement = await asyncio.to_thread(asyncio.run, in_other_loop())
+        assert replacement is not client
+        assert client.is_closed
+        await close_shared_client()
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+"""Tests for reading generated text out of provider responses."""
+
+from __future__ import annotations
+
+from app.routers.inference import _extract_gemini_text, _extract_huggingface_text, _extract_openai_text
+
+
+def test_openai_text_comes_from_the_first_choice_only() -> None:
+    assert _extract_openai_text({"choices": [{"message": {"role": "assistant", "content": "Hi"}}]}) == "Hi"
+    assert _extract_openai_text({"choices": [{"text": "legacy completion"}]}) == "legacy completion"
+
+    # A tool call leaves the first message without text; later choices are not consulted.
+    assert _extract_openai_text({"choices": [{"message": {"content": None}}, {"message": {"content": "Hi"}}]}) is None
+    assert _extract_openai_text({"choices": []}) is None
+    assert _extract_openai_text({"error": {"message": "rate limited"}}) is None
+    assert _extract_openai_text(["not", "a", "completion"]) is None
+
+
+def test_gemini_text_comes_from_the_first_part_only() -> None:
+    payload = {"candidates": [{"content": {"parts": [{"text": "Hello"}, {"text": " world"}]}}]}
+    assert _extract_gemini_text(payload) == "Hello"
+
+    # A first part without text (e.g. a function call) is not skipped over, and
+    # a candidate-level ``text`` is no longer used as a fallback.
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"name": "f"}}, {"text": "Hello"}]}}]}
+    assert _extract_gemini_text(payload) is None
+    assert _extract_gemini_text({"candidates": [{"text": "Hello"}]}) is None
+    assert _extract_gemini_text({"candidates": [{"content": {"parts": [{"text": None}]}}]}) is None
+    assert _extract_gemini_text({"promptFeedback": {"blockReason": "SAFETY"}}) is None
+
+
+def test_huggingface_text_generation_shapes() -> None:
+    assert _extract_huggingface_text([{"generated_text": "Hi"}]) == "Hi"
+    assert _extract_huggingface_text({"generated_text": "Hi"}) == "Hi"
+    assert _extract_huggingface_text([{"summary_text": "Short"}]) == "Short"
+    assert _extract_huggingface_text({"choices": [{"message": {"content": "Hi"}}]}) == "Hi"
+    assert _extract_huggingface_text("plain") == "plain"
+    assert _extract_huggingface_text({"error": 503}) is None
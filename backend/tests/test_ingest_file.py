@@ -0,0 +1,80 @@
+"""Tests for file uploads through the knowledge base routes."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.deps import get_knowledge_base_manager
+from app.routers import knowledge_bases
+from app.services.knowledge_base import KnowledgeBaseManager
+
+
+@pytest.fixture()
+def client(tmp_path: Path) -> TestClient:
+    manager = KnowledgeBaseManager(tmp_path / "storage", tmp_path / "prebuilt")
+    app = FastAPI()
+    app.include_router(knowledge_bases.router, prefix="/api")
+    app.dependency_overrides[get_knowledge_base_manager] = lambda: manager
+    yield TestClient(app)
+    manager.close()
+
+
+@pytest.fixture()
+def kb_id(client: TestClient) -> str:
+    response = client.post("/api/knowledge-bases", json={"name": "Uploads"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_uploaded_text_is_indexed_and_stored(client: TestClient, kb_id: str) -> None:
+    content = "Flowport uploads are chunked straight from the spooled file.\n".encode("utf-8")
+
+    response = client.post(
+        f"/api/knowledge-bases/{kb_id}/ingest/file",
+        files={"file": ("notes.txt", content, "text/plain")},
+        data={"chunk_size": "200", "chunk_overlap": "20"},
+    )
+    assert response.status_code == 201
+    document = response.json()
+    assert document["title"] == "notes"
+    assert document["size_bytes"] == len(content)
+    assert document["file_available"] is True
+
+    download = client.get(f"/api/knowledge-bases/{kb_id}/documents/{document['id']}/file")
+    assert download.status_code == 200
+    assert download.content == content
+
+    matches = client.post(f"/api/knowledge-bases/{kb_id}/query", json={"query": "spooled file"}).json()["matches"]
+    assert [match["document_id"] for match in matches] == [document["id"]]
+
+
+def test_large_upload_is_copied_in_full(client: TestClient, kb_id: str) -> None:
+    # Larger than Starlette's in-memory spool, so the upload is read back from disk.
+    content = os.urandom(3 * 1024 * 1024 + 17)
+
+    response = client.post(
+        f"/api/knowledge-bases/{kb_id}/ingest/file",
+        files={"file": ("diagram.png", content, "image/png")},
+    )
+    assert response.status_code == 201
+    document = response.json()
+    assert document["size_bytes"] == len(content)
+
+    download = client.get(f"/api/knowledge-bases/{kb_id}/documents/{document['id']}/file")
+    assert download.content == content
+
+
+def test_empty_upload_is_rejected(client: TestClient, kb_id: str) -> None:
+    response = client.post(
+        f"/api/knowledge-bases/{kb_id}/ingest/file",
+        files={"file": ("empty.txt", b"", "text/plain")},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Uploaded file is empty"
+    assert client.get(f"/api/knowledge-bases/{kb_id}").json()["documents"] == []
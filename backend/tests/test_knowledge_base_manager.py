@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -10,6 +14,7 @@ import pytest
 from app.models.knowledge_base import (
     KnowledgeBaseAutoBuildRequest,
     KnowledgeBaseCreateRequest,
+    KnowledgeItem,
     TextIngestRequest,
 )
 from app.services.knowledge_base import KnowledgeBaseManager
@@ -56,4 +61,170 @@ def test_auto_build_requires_items(manager: KnowledgeBaseManager) -> None:
             manager.auto_build(
                 KnowledgeBaseAutoBuildRequest(name="Invalid", description=None, knowledge_items=[])
             )
-        )
\ No newline at end of file
+        )
+
+
+def test_auto_build_indexes_all_items(manager: KnowledgeBaseManager) -> None:
+    kb = asyncio.run(
+        manager.auto_build(
+            KnowledgeBaseAutoBuildRequest(
+                name="Batch",
+                description=None,
+                knowledge_items=[
+                    KnowledgeItem(title="Routing", content="Flowport routes inference requests."),
+                    KnowledgeItem(title="Retrieval", content="Flowknow stores retrieval knowledge."),
+                ],
+            )
+        )
+    )
+    assert kb.ready
+    assert kb.document_count == 2
+    assert manager.query(kb.id, "retrieval knowledge", top_k=1).matches[0].document_title == "Retrieval"
+
+
+def test_query_reloads_index_rebuilt_elsewhere(manager: KnowledgeBaseManager) -> None:
+    created = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Shared KB", description=None))
+    asyncio.run(
+        manager.ingest_text(created.id, TextIngestRequest(title="First", content="Flowport routes inference requests."))
+    )
+    assert manager.query(created.id, "inference", top_k=1).matches
+
+    # A second manager over the same storage stands in for another worker process.
+    other = KnowledgeBaseManager(manager.storage_dir, manager.prebuilt_dir)
+    asyncio.run(
+        other.ingest_text(created.id, TextIngestRequest(title="Second", content="Flowknow stores retrieval knowledge."))
+    )
+
+    response = manager.query(created.id, "retrieval knowledge", top_k=1)
+    assert response.matches
+    assert response.matches[0].document_title == "Second"
+
+
+def test_legacy_chunk_files_are_packed_on_open(manager: KnowledgeBaseManager) -> None:
+    created = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Legacy KB", description=None))
+    document = asyncio.run(
+        manager.ingest_text(created.id, TextIngestRequest(title="Doc", content="Flowport packs chunk text."))
+    )
+
+    # Rewrite the chunks in the one-file-per-chunk layout used by older versions.
+    chunks_dir = manager.storage_dir / created.id / "chunks"
+    contents = {chunk.id: chunk.content for chunk in manager.get_document(created.id, document.id).chunks}
+    manager.close()
+    for path in chunks_dir.iterdir():
+        path.unlink()
+    for chunk_id, content in contents.items():
+        (chunks_dir / f"{chunk_id}.txt").write_text(content, encoding="utf-8")
+
+    reopened = KnowledgeBaseManager(manager.storage_dir, manager.prebuilt_dir)
+    detail = reopened.get_document(created.id, document.id)
+    assert {chunk.id: chunk.content for chunk in detail.chunks} == contents
+    assert not list(chunks_dir.glob("*.txt"))
+    reopened.close()
+
+
+def test_ingest_into_unknown_knowledge_base_writes_nothing(manager: KnowledgeBaseManager) -> None:
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(manager.ingest_text("missing", TextIngestRequest(title="Doc", content="Orphaned chunk text.")))
+
+    assert not (manager.storage_dir / "missing").exists()
+
+
+def test_query_cache_matches_equivalent_queries_until_rebuild(manager: KnowledgeBaseManager) -> None:
+    created = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Cached KB", description=None))
+    asyncio.run(
+        manager.ingest_text(created.id, TextIngestRequest(title="First", content="Flowport routes inference requests."))
+    )
+
+    first = manager.query(created.id, "How are inference requests routed?", top_k=2)
+    again = manager.query(created.id, "how are INFERENCE requests routed", top_k=2)
+    assert again.query == "how are INFERENCE requests routed"
+    assert again.matches == first.matches
+
+    asyncio.run(
+        manager.ingest_text(created.id, TextIngestRequest(title="Second", content="Inference requests are retried."))
+    )
+    rebuilt = manager.query(created.id, "How are inference requests routed?", top_k=2)
+    titles = {match.document_title for match in rebuilt.matches}
+    assert titles == {"First", "Second"}
+
+
+def test_list_picks_up_knowledge_bases_created_elsewhere(manager: KnowledgeBaseManager) -> None:
+    first = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="First KB", description=None))
+    assert [kb.id for kb in manager.list_knowledge_bases()] == [first.id]
+
+    other = KnowledgeBaseManager(manager.storage_dir, manager.prebuilt_dir)
+    second = other.create_knowledge_base(KnowledgeBaseCreateRequest(name="Second KB", description=None))
+    assert {kb.id for kb in manager.list_knowledge_bases()} == {first.id, second.id}
+
+
+def test_metadata_rewritten_within_one_mtime_tick_is_reloaded(manager: KnowledgeBaseManager) -> None:
+    created = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Alpha KB", description=None))
+    metadata_path = manager.storage_dir / created.id / "metadata.json"
+    before = metadata_path.stat()
+
+    # Another worker rewrites the file with same-sized content, and a coarse
+    # filesystem clock leaves the mtime unchanged.
+    other = KnowledgeBaseManager(manager.storage_dir, manager.prebuilt_dir)
+    metadata = other._load_metadata_for_update(created.id)
+    metadata["name"] = "Omega KB"
+    other._write_metadata(created.id, metadata)
+    os.utime(metadata_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert metadata_path.stat().st_size == before.st_size
+
+    assert manager.get_knowledge_base(created.id).name == "Omega KB"
+
+
+def _make_pdf(lines: list[str]) -> bytes:
+    pdfium = pytest.importorskip("pypdfium2")
+    import ctypes
+
+    import pypdfium2.raw as pdfium_c
+
+    pdf = pdfium.PdfDocument.new()
+    for line in lines:
+        page = pdf.new_page(300, 200)
+        text_obj = pdfium_c.FPDFPageObj_NewTextObj(pdf, b"Helvetica", 12.0)
+        encoded = (ctypes.c_ushort * (len(line) + 1))(*map(ord, line), 0)
+        pdfium_c.FPDFText_SetText(text_obj, encoded)
+        pdfium_c.FPDFPageObj_Transform(text_obj, 1, 0, 0, 1, 20, 100)
+        pdfium_c.FPDFPage_InsertObject(page.raw, text_obj)
+        pdfium_c.FPDFPage_GenerateContent(page.raw)
+        page.close()
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    pdf.close()
+    return buffer.getvalue()
+
+
+def test_pdf_extraction_from_concurrent_threads(manager: KnowledgeBaseManager) -> None:
+    documents = {
+        "first.pdf": _make_pdf([f"Flowport first page {i}" for i in range(20)]),
+        "second.pdf": _make_pdf([f"Flowknow second page {i}" for i in range(20)]),
+    }
+    barrier = threading.Barrier(len(documents))
+
+    def extract(name: str) -> str:
+        barrier.wait()
+        return manager._extract_text_from_file(name, "application/pdf", io.BytesIO(documents[name]))
+
+    with ThreadPoolExecutor(max_workers=len(documents)) as pool:
+        results = dict(zip(documents, pool.map(extract, documents)))
+
+    assert results["first.pdf"].splitlines() == [f"Flowport first page {i}" for i in range(20)]
+    assert results["second.pdf"].splitlines() == [f"Flowknow second page {i}" for i in range(20)]
+
+
+def test_warm_up_skips_unloadable_indexes(manager: KnowledgeBaseManager, caplog: pytest.LogCaptureFixture) -> None:
+    broken = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Broken KB", description=None))
+    healthy = manager.create_knowledge_base(KnowledgeBaseCreateRequest(name="Healthy KB", description=None))
+    for kb in (broken, healthy):
+        asyncio.run(manager.ingest_text(kb.id, TextIngestRequest(title="Doc", content="Flowport warms indexes.")))
+    (manager.storage_dir / broken.id / "index.joblib").write_bytes(b"not a pickle")
+
+    fresh = KnowledgeBaseManager(manager.storage_dir, manager.prebuilt_dir)
+    with caplog.at_level("WARNING"):
+        fresh.warm_up()
+
+    assert broken.id in caplog.text
+    assert healthy.id in fresh._indexes
+    assert broken.id not in fresh._indexes
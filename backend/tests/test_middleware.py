@@ -0,0 +1,70 @@
+"""Tests for the public CORS middleware."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.middleware import PublicCORSMiddleware
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(PublicCORSMiddleware)
+
+    @app.get("/items")
+    def list_items() -> dict:
+        return {"items": []}
+
+    @app.options("/items")
+    def describe_items() -> Response:
+        return Response(status_code=204, headers={"allow": "GET, OPTIONS"})
+
+    return TestClient(app)
+
+
+def test_preflight_echoes_requested_headers(client: TestClient) -> None:
+    response = client.options(
+        "/items",
+        headers={
+            "Origin": "https://example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert response.headers["access-control-allow-headers"] == "authorization"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_preflight_without_requested_headers(client: TestClient) -> None:
+    response = client.options(
+        "/items",
+        headers={"Origin": "https://example.com", "Access-Control-Request-Method": "GET"},
+    )
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-headers" not in response.headers
+
+
+def test_regular_responses_allow_any_origin(client: TestClient) -> None:
+    response = client.get("/items", headers={"Origin": "https://example.com"})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": []}
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_plain_options_request_reaches_the_app(client: TestClient) -> None:
+    response = client.options("/items")
+
+    assert response.status_code == 204
+    assert response.headers["allow"] == "GET, OPTIONS"
+    assert response.headers["access-control-allow-origin"] == "*"
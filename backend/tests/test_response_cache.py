@@ -0,0 +1,70 @@
+"""Unit tests for the inference response cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.services.response_cache import (
+    ResponseCache,
+    ResponseCacheMode,
+    is_cacheable,
+    response_cache_key,
+)
+
+
+def test_cache_key_is_stable_and_scoped_to_api_key() -> None:
+    messages = [{"role": "user", "content": "Hello"}]
+    key = response_cache_key("openai", "gpt", messages, {"max_tokens": 5, "top_p": 1}, "key-a")
+
+    assert key == response_cache_key("openai", "gpt", messages, {"top_p": 1, "max_tokens": 5}, "key-a")
+    assert key != response_cache_key("openai", "gpt", messages, {"top_p": 1, "max_tokens": 5}, "key-b")
+
+
+def test_sampling_requests_are_not_cacheable() -> None:
+    assert is_cacheable({"temperature": 0})
+    assert not is_cacheable({"temperature": 0.7})
+    assert not is_cacheable({"generationConfig": {"temperature": 1}})
+    assert not is_cacheable({"stream": True})
+    assert not is_cacheable({})
+    assert not is_cacheable({"max_tokens": 512})
+    assert not is_cacheable({"generationConfig": {"maxOutputTokens": 64}})
+    assert not is_cacheable({"temperature": 0, "stream": True})
+    assert is_cacheable({"generationConfig": {"temperature": 0}})
+    assert is_cacheable({"do_sample": False})
+    assert not is_cacheable({"do_sample": True})
+
+
+def test_lru_eviction_and_replay_mode() -> None:
+    async def scenario() -> None:
+        cache = ResponseCache(max_entries=1)
+        await cache.set("a", ({"id": 1}, "one"))
+        await cache.set("b", ({"id": 2}, "two"))
+        assert await cache.get("a") is None
+        assert await cache.get("b") == ({"id": 2}, "two")
+
+        cache.mode = ResponseCacheMode.REPLAY
+        await cache.set("c", ({"id": 3}, "three"))
+        assert await cache.get("c") is None
+        assert await cache.get("b") == ({"id": 2}, "two")
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_share_one_fetch() -> None:
+    calls = 0
+
+    async def fetch() -> tuple[dict[str, int], str]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": calls}, "shared"
+
+    async def scenario() -> list[tuple[dict[str, int], str]]:
+        cache = ResponseCache()
+        results = await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+        results.append(await cache.get_or_fetch("key", fetch))
+        return results
+
+    results = asyncio.run(scenario())
+    assert calls == 1
+    assert all(result == ({"id": 1}, "shared") for result in results)
@@ -0,0 +1,21 @@
+"""Tests for the JSON serialization helpers."""
+
+from __future__ import annotations
+
+import json
+
+from app.utils.serialization import dumps, loads
+
+
+def test_dumps_round_trips_compact_and_indented() -> None:
+    value = {"name": "café", "items": [1, 2.5, None, True]}
+
+    assert dumps(value) == b'{"name":"caf\xc3\xa9","items":[1,2.5,null,true]}'
+    assert loads(dumps(value, indent=True)) == value
+
+
+def test_dumps_accepts_values_orjson_rejects() -> None:
+    value = {"parameters": {"seed": 2**64}}
+
+    assert dumps(value) == b'{"parameters":{"seed":18446744073709551616}}'
+    assert json.loads(dumps(value, indent=True)) == value
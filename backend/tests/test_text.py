@@ -0,0 +1,60 @@
+"""Regression tests for the text helpers."""
+
+from __future__ import annotations
+
+import re
+import sys
+
+from app.utils.text import chunk_text, normalize_text
+
+
+def _reference_chunks(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """The original word-list implementation ``chunk_text`` must agree with."""
+
+    words = text.split()
+    step = max(1, chunk_size - chunk_overlap)
+    return [" ".join(words[start : start + chunk_size]) for start in range(0, len(words), step)]
+
+
+def test_normalize_collapses_and_strips_whitespace() -> None:
+    assert normalize_text("  Hello,\t\tworld!\n\nBye  ") == "Hello, world! Bye"
+    assert normalize_text("café\u00a0au\u2003lait\x1cnoir\u3000") == "café au lait noir"
+    assert normalize_text(" \r\n\u2028 ") == ""
+    assert normalize_text("") == ""
+
+
+def test_normalize_matches_regex_whitespace_class() -> None:
+    whitespace = "".join(chr(code) for code in range(sys.maxunicode + 1) if re.match(r"\s", chr(code)))
+    text = f"{whitespace}a{whitespace}b c\u200bd{whitespace}"
+
+    assert normalize_text(text) == re.sub(r"\s+", " ", text).strip() == "a b c\u200bd"
+
+
+def test_chunks_overlap_by_word_count() -> None:
+    text = " ".join(f"w{i}" for i in range(10))
+
+    assert chunk_text(text, chunk_size=4, chunk_overlap=1) == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9", "w9"]
+    assert chunk_text(text, chunk_size=4, chunk_overlap=1) == _reference_chunks(text, 4, 1)
+
+
+def test_overlap_at_least_chunk_size_advances_one_word() -> None:
+    text = "a b c d"
+
+    for overlap in (3, 4, 10):
+        assert chunk_text(text, chunk_size=3, chunk_overlap=overlap) == ["a b c", "b c d", "c d", "d"]
+        assert chunk_text(text, chunk_size=3, chunk_overlap=overlap) == _reference_chunks(text, 3, overlap)
+
+
+def test_single_word_and_empty_text() -> None:
+    assert chunk_text("solitary", chunk_size=5, chunk_overlap=2) == ["solitary"]
+    assert chunk_text("  solitary\n", chunk_size=1, chunk_overlap=0) == ["solitary"]
+    assert chunk_text("", chunk_size=5) == []
+    assert chunk_text(" \t\n ", chunk_size=5) == []
+    assert chunk_text("a b", chunk_size=0) == []
+
+
+def test_unicode_whitespace_separates_words() -> None:
+    text = "alpha\u00a0beta\u2003gamma\x1cdelta\u3000\u3000epsilon\u2029"
+
+    assert chunk_text(text, chunk_size=2, chunk_overlap=0) == ["alpha beta", "gamma delta", "epsilon"]
+    assert chunk_text(text, chunk_size=2, chunk_overlap=1) == _reference_chunks(text, 2, 1)